@@ -1,14 +1,232 @@
+import collections
+import concurrent.futures
+import datetime
+import fnmatch
+import functools
+import itertools
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import string
+import struct
+import threading
+import unicodedata
+import uuid
 import tkinter as tk
-from tkinter import filedialog, messagebox, ttk
+from tkinter import filedialog, messagebox, simpledialog, ttk
+
+logger = logging.getLogger(__name__)
+
+# Number of directories read concurrently during a recursive scan
+SCAN_WORKERS = 8
+
+# Number of destination directories renamed concurrently
+RENAME_WORKERS = 8
+
+# File name length limit assumed where the OS can't report one
+DEFAULT_NAME_MAX = 255
+
+# Characters Windows refuses in file names, besides control characters
+WINDOWS_INVALID_CHARS = frozenset('<>:"/\\|?*')
+
+# EXIF tag numbers, so lookups never need to scan ExifTags.TAGS
+EXIF_IFD_POINTER = 0x8769
+EXIF_DATETIME_ORIGINAL = 0x9003
+
+
+@functools.lru_cache(maxsize=None)
+def _load_pil_image():
+    """Import Pillow's Image module on first use, or return None if it is missing.
+
+    Pillow is only needed for EXIF dates outside JPEG and TIFF, so startup
+    doesn't pay for importing it.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    return Image
+
+
+def _name_max(directory):
+    try:
+        return os.pathconf(directory or ".", "PC_NAME_MAX")
+    except (AttributeError, OSError, ValueError):
+        return DEFAULT_NAME_MAX
+
+
+def _name_problem(name, name_max):
+    """Return why name can't be used as a file name on this OS, or None."""
+    if name in ("", ".", ".."):
+        return "name is empty"
+    if os.name == "nt":
+        bad = next((c for c in name if c in WINDOWS_INVALID_CHARS or ord(c) < 32), None)
+        if bad is not None:
+            return f"name contains {bad!r}"
+        if name[-1] in " .":
+            return "name ends with a space or dot"
+        length = len(name.encode("utf-16-le", "surrogatepass")) // 2
+    else:
+        if "\0" in name:
+            return "name contains a NUL character"
+        length = len(os.fsencode(name))
+    if length > name_max:
+        return "name is too long for this file system"
+    return None
+
+
+def _fold_name(name):
+    """Key for comparing file names the way case-insensitive file systems do.
+
+    NFC normalization matches the NFD names APFS and HFS+ may store, and
+    casefold() covers case pairs that lower() leaves distinct.
+    """
+    return unicodedata.normalize("NFC", name).casefold()
+
+
+@functools.lru_cache(maxsize=128)
+def _compile_find(find_text):
+    """Compile find_text as a literal case-insensitive pattern, reused across previews."""
+    return re.compile(re.escape(find_text), re.IGNORECASE)
+
+
+# strftime directives that depend only on the calendar day
+DATE_DIRECTIVES = frozenset("aAbBCdDeFgGhjmuUVwWyY%")
+
+
+@functools.lru_cache(maxsize=64)
+def _is_date_only(date_format):
+    return all(d in DATE_DIRECTIVES for d in re.findall(r"%[-_0^#]?(.)", date_format))
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_day(day, date_format):
+    return day.strftime(date_format)
+
+
+def _format_datetime(dt, date_format):
+    """strftime, memoized per calendar day when the format has no time fields.
+
+    Files from one import mostly share a few days, so a batch of thousands of
+    files only formats a handful of distinct dates.
+    """
+    if _is_date_only(date_format):
+        return _format_day(dt.date(), date_format)
+    return dt.strftime(date_format)
+
+
+def _read_ifd_tag(f, base, endian, ifd_offset, wanted):
+    """Return (type, count, value_field) for tag `wanted` in the IFD at ifd_offset, or None."""
+    f.seek(base + ifd_offset)
+    raw = f.read(2)
+    if len(raw) < 2:
+        return None
+    (count,) = struct.unpack(endian + "H", raw)
+    entries = f.read(count * 12)
+    for i in range(0, len(entries) - 11, 12):
+        tag, typ, n = struct.unpack_from(endian + "HHI", entries, i)
+        if tag == wanted:
+            return typ, n, entries[i + 8:i + 12]
+    return None
+
+
+def _read_tiff_datetime_original(f, base):
+    """Read DateTimeOriginal from the TIFF structure starting at offset base of f."""
+    f.seek(base)
+    header = f.read(8)
+    if header[:2] == b"II":
+        endian = "<"
+    elif header[:2] == b"MM":
+        endian = ">"
+    else:
+        raise ValueError("not a TIFF header")
+    magic, ifd0 = struct.unpack(endian + "HI", header[2:8])
+    if magic != 42:
+        raise ValueError("not a TIFF header")
+
+    pointer = _read_ifd_tag(f, base, endian, ifd0, EXIF_IFD_POINTER)
+    if pointer is None:
+        return None
+    (exif_ifd,) = struct.unpack(endian + "I", pointer[2])
+
+    entry = _read_ifd_tag(f, base, endian, exif_ifd, EXIF_DATETIME_ORIGINAL)
+    if entry is None:
+        return None
+    _, n, field = entry
+    if n <= 4:
+        value = field[:n]
+    else:
+        (offset,) = struct.unpack(endian + "I", field)
+        f.seek(base + offset)
+        value = f.read(n)
+    return value.rstrip(b"\x00 ")
+
+
+def _exif_datetime_original(path):
+    """Return the raw DateTimeOriginal bytes of a JPEG or TIFF file without decoding it.
+
+    Returns None when the file has no such tag and raises ValueError when the
+    format is not understood, so callers can fall back to Pillow.
+    """
+    with open(path, "rb") as f:
+        head = f.read(4)
+        if head[:2] != b"\xff\xd8":
+            if head in (b"II*\x00", b"MM\x00*"):
+                return _read_tiff_datetime_original(f, 0)
+            raise ValueError("unsupported image format")
+
+        # Walk the JPEG segments until the EXIF APP1 block or the image data
+        f.seek(2)
+        while True:
+            marker = f.read(4)
+            if len(marker) < 4 or marker[0] != 0xFF:
+                return None
+            kind = marker[1]
+            (length,) = struct.unpack(">H", marker[2:])
+            if kind == 0xDA:
+                return None
+            if kind == 0xE1 and f.read(6) == b"Exif\x00\x00":
+                return _read_tiff_datetime_original(f, f.tell())
+            f.seek(f.tell() - (6 if kind == 0xE1 else 0) + length - 2)
+
 
 class BulkFileRenamer(tk.Tk):
     def __init__(self):
         super().__init__()
 
+        # delay=True keeps rename.log from being created until something is logged
+        log_file = logging.FileHandler('rename.log', delay=True)
+        log_file.setFormatter(logging.Formatter('%(asctime)s - %(message)s'))
+        # Buffer rename records, errors included, and write them out once per batch
+        self._log_buffer = logging.handlers.MemoryHandler(10000, flushLevel=logging.CRITICAL, target=log_file)
+        logging.basicConfig(level=logging.INFO, handlers=[self._log_buffer])
+
         self.title("Bulk File Renamer")
         self.geometry("1200x800")
 
+        self._progress_q = queue.Queue()
+        self._rename_progress = 0
+        self._walk_cache = None
+        self._scan_generation = 0
+        self._stat_cache = {}
+        self._dir_entries = {}
+        self._reload_after_id = None
+        self._pattern_dirty = True
+        self._pattern = ""
+        self._render = None
+        self._render_key = None
+        self._preview_signature = None
+        self._preview_result = []
+        self._shown_preview = None
+        self._rows = ((), [])
+        self._busy = False
+
         self.create_widgets()
+        # The rename thread is a daemon, so closing mid-batch would kill it and
+        # leave files hidden under their staging names
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
 
     def create_widgets(self):
         # Main frame
@@ -25,6 +243,7 @@ class BulkFileRenamer(tk.Tk):
 
         browse_button = ttk.Button(dir_frame, text="Browse...", command=self.browse_directory)
         browse_button.pack(side=tk.LEFT, padx=5, pady=5)
+        self.browse_button = browse_button
 
         # Filter options
         filter_frame = ttk.LabelFrame(main_frame, text="Filtering")
@@ -37,7 +256,13 @@ class BulkFileRenamer(tk.Tk):
         self.file_types_var = tk.StringVar(value=".jpg, .jpeg, .png, .gif, .bmp, .tiff, .raw")
         file_types_entry = ttk.Entry(filter_frame, textvariable=self.file_types_var, width=50)
         file_types_entry.pack(side=tk.LEFT, padx=5, pady=5)
-        file_types_entry.bind("<Return>", lambda event: self.load_files())
+        file_types_entry.bind("<Return>", lambda event: self.schedule_filter_reload())
+
+        ttk.Label(filter_frame, text="Skip folders:").pack(side=tk.LEFT, padx=5)
+        self.excluded_dirs_var = tk.StringVar(value=".*, node_modules, __pycache__")
+        excluded_dirs_entry = ttk.Entry(filter_frame, textvariable=self.excluded_dirs_var, width=30)
+        excluded_dirs_entry.pack(side=tk.LEFT, padx=5, pady=5)
+        excluded_dirs_entry.bind("<Return>", lambda event: self.load_files())
 
 
         # File list
@@ -141,9 +366,11 @@ class BulkFileRenamer(tk.Tk):
 
         preview_button = ttk.Button(ops_frame, text="Preview Changes", command=self.preview_rename)
         preview_button.pack(pady=5)
+        self.preview_button = preview_button
 
         rename_button = ttk.Button(ops_frame, text="Rename Files", command=self.rename_files)
         rename_button.pack(pady=5)
+        self.rename_button = rename_button
 
         self.progress_bar = ttk.Progressbar(main_frame, orient="horizontal", length=100, mode="determinate")
         self.progress_bar.pack(fill=tk.X, padx=5, pady=5)
@@ -161,36 +388,177 @@ class BulkFileRenamer(tk.Tk):
             self.dir_path_var.set(directory)
             self.load_files()
 
-    def load_files(self):
-        # Clear existing files
-        for i in self.file_list.get_children():
-            self.file_list.delete(i)
+    def schedule_filter_reload(self):
+        # Collapse bursts of filter edits into a single reload
+        if self._reload_after_id is not None:
+            self.after_cancel(self._reload_after_id)
+        self._reload_after_id = self.after(200, self._reload_filtered)
+
+    def _reload_filtered(self):
+        self._reload_after_id = None
+        self.load_files(use_cache=True)
+
+    def load_files(self, use_cache=False):
+        self._stat_cache = {}
+        self._dir_entries = {}
+        self._preview_signature = None
+        # A scan still running for an earlier request is ignored when it finishes
+        self._scan_generation += 1
+        self.config(cursor="")
 
         path = self.dir_path_var.get()
         if not path:
+            self._clear_files()
             return
 
-        import os
-        file_types = [ft.strip() for ft in self.file_types_var.get().split(',')]
+        recursive = self.recursive_var.get()
+        excluded = tuple(p.strip() for p in self.excluded_dirs_var.get().split(',') if p.strip())
+
+        # Only a change of the extension filter may reuse the previous walk, and
+        # only while the top-level directory is unmodified. A change inside a
+        # subfolder doesn't touch that mtime, so recursive walks are never reused
+        key = (path, recursive, excluded)
+        try:
+            stamp = os.stat(path).st_mtime_ns
+        except OSError as e:
+            self._clear_files()
+            messagebox.showerror("Error", f"Could not read {path}: {e}")
+            return
+        if use_cache and not recursive and self._walk_cache is not None and self._walk_cache[:2] == (key, stamp):
+            self._show_files(self._walk_cache[2])
+            return
 
-        if self.recursive_var.get():
-            for root, _, files in os.walk(path):
-                for filename in files:
-                    if any(filename.lower().endswith(ft) for ft in file_types):
-                        full_path = os.path.join(root, filename)
-                        self.file_list.insert("", "end", text=full_path, values=(filename,))
-        else:
-            for filename in os.listdir(path):
-                if os.path.isfile(os.path.join(path, filename)):
-                    if any(filename.lower().endswith(ft) for ft in file_types):
-                        self.file_list.insert("", "end", text=os.path.join(path, filename), values=(filename,))
+        # Walk the directory off the Tk thread so large trees don't freeze the window
+        self._clear_files()
+        results = queue.SimpleQueue()
+        threading.Thread(target=self._scan_worker, args=(results, path, recursive, excluded), daemon=True).start()
+        self.config(cursor="watch")
+        self.after(50, self._poll_scan, results, self._scan_generation, key, stamp)
+
+    def _scan_worker(self, results, path, recursive, excluded):
+        try:
+            results.put(self._scan_files(path, recursive, excluded))
+        # Anything raised here must still reach _poll_scan, or it polls forever
+        except Exception as e:
+            results.put(e)
+
+    def _poll_scan(self, results, generation, key, stamp):
+        if generation != self._scan_generation:
+            return
+        try:
+            entries = results.get_nowait()
+        except queue.Empty:
+            self.after(50, self._poll_scan, results, generation, key, stamp)
+            return
 
-    def preview_rename(self):
-        import os
-        import re
-        import datetime
-        from PIL import Image, ExifTags
+        self.config(cursor="")
+        if isinstance(entries, Exception):
+            messagebox.showerror("Error", f"Could not read {key[0]}: {entries}")
+            return
 
+        # Parallel lists keep the filter pass to one flat list of names
+        paths = [entry.path for entry in entries]
+        filenames = [entry.name for entry in entries]
+        lowered = [name.lower() for name in filenames]
+        # Only the last flat walk is kept
+        self._walk_cache = None if key[1] else (key, stamp, (paths, filenames, lowered))
+        # Fresh entries can hand out their stat for free where the OS supports it
+        self._dir_entries = {entry.path: entry for entry in entries}
+        self._show_files((paths, filenames, lowered))
+
+    def _clear_files(self):
+        self.file_list.delete(*self.file_list.get_children())
+        self._shown_preview = None
+        self._rows = ((), [])
+
+    def _show_files(self, listing):
+        paths, filenames, lowered = listing
+
+        # A single tuple lets str.endswith test every extension in one C call.
+        # Blank entries (a trailing comma) would match every file, so they are
+        # dropped; a blank field still lists everything
+        file_types = (ft.strip().lower() for ft in self.file_types_var.get().split(','))
+        file_types = tuple(ft for ft in file_types if ft) or ("",)
+
+        keep = [name.endswith(file_types) for name in lowered]
+        row_paths = list(itertools.compress(paths, keep))
+        row_names = list(itertools.compress(filenames, keep))
+
+        # Reloading the same files keeps the existing rows and only resets the
+        # ones that still show a previewed name
+        items, shown_paths = self._rows
+        if items and shown_paths == row_paths:
+            for item, filename, shown_name in zip(items, row_names, self._shown_preview[1]):
+                if filename != shown_name:
+                    self.file_list.item(item, values=(filename,))
+            self._shown_preview = (items, row_names)
+            return
+
+        self._clear_files()
+        # Unmap the tree while populating so Tk lays it out once instead of per row
+        self.file_list.pack_forget()
+        items = tuple(
+            self.file_list.insert("", "end", text=full_path, values=(filename,))
+            for full_path, filename in zip(row_paths, row_names)
+        )
+        self.file_list.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        # Keep the row paths on the Python side so previews never read them back from Tk
+        self._rows = (items, row_paths)
+        # Fresh rows show their current names; previews diff against these
+        self._shown_preview = (items, row_names)
+
+    def _scan_files(self, path, recursive, excluded=()):
+        """Return an os.DirEntry for every file in path, depth first like os.walk.
+
+        os.scandir entries carry their file type from the directory read, so no
+        extra stat is needed per entry on most platforms. Subdirectories whose
+        name matches one of the excluded glob patterns are never entered.
+        """
+        skip = re.compile("|".join(fnmatch.translate(p) for p in excluded)).match if excluded else None
+        if not recursive:
+            return self._scan_directory(path, skip, False)[0]
+
+        # Keep many directory reads in flight; this hides the per-call latency
+        # of network shares and costs little on local disks
+        listings = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=SCAN_WORKERS) as ex:
+            pending = {ex.submit(self._scan_directory, path, skip, True): path}
+            while pending:
+                finished, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in finished:
+                    directory = pending.pop(future)
+                    try:
+                        files, subdirs = future.result()
+                    except OSError:
+                        if directory == path:
+                            raise
+                        files, subdirs = [], []
+                    listings[directory] = (files, subdirs)
+                    for subdir in subdirs:
+                        pending[ex.submit(self._scan_directory, subdir, skip, True)] = subdir
+
+        # Reassemble the results in a stable, os.walk-like order
+        ordered = []
+        stack = [path]
+        while stack:
+            files, subdirs = listings[stack.pop()]
+            ordered.extend(files)
+            stack.extend(reversed(subdirs))
+        return ordered
+
+    def _scan_directory(self, directory, skip, recursive):
+        files = []
+        subdirs = []
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive and not (skip and skip(entry.name)):
+                        subdirs.append(entry.path)
+                elif entry.is_file():
+                    files.append(entry)
+        return files, subdirs
+
+    def preview_rename(self):
         prefix = self.prefix_var.get()
         suffix = self.suffix_var.get()
         add_numbers = self.add_numbers_var.get()
@@ -202,111 +570,405 @@ class BulkFileRenamer(tk.Tk):
         add_date = self.add_date_var.get()
         date_type = self.date_type_var.get()
         date_format = self.date_format_var.get()
-        
-        pattern_parts = self.pattern_listbox.get(0, tk.END)
-        pattern = "".join(pattern_parts)
-
 
-        for i, item in enumerate(self.file_list.get_children()):
-            full_path = self.file_list.item(item, "text")
-            original_filename = os.path.basename(full_path)
-            
-            name, ext = os.path.splitext(original_filename)
-            
-            # Apply find and replace
-            if find_text:
-                if case_sensitive:
-                    name = name.replace(find_text, replace_text)
-                else:
-                    name = re.sub(find_text, replace_text, name, flags=re.IGNORECASE)
-
-            # Number
-            num_str = ""
-            if add_numbers:
-                num_str = str(start_num + i).zfill(padding)
-
-            # Date
-            date_str = ""
-            if add_date:
+        render = self._get_render(prefix, suffix)
+        items, full_paths = self._rows
+
+        # Renaming right after a preview reuses its result when nothing changed;
+        # every reload clears the signature
+        signature = (
+            items, self._pattern, prefix, suffix, add_numbers, start_num, padding,
+            find_text, replace_text, case_sensitive, add_date, date_type, date_format,
+        )
+        if signature == self._preview_signature:
+            return self._preview_result
+
+        # Both find and replace are literal: a case-sensitive match is a plain
+        # str.replace, a case-insensitive one a cached compiled pattern
+        find_re = None
+        if find_text and not case_sensitive:
+            find_re = _compile_find(find_text)
+            escaped_replace = replace_text.replace("\\", "\\\\")
+
+        # One C-level int-to-padded-string conversion per file instead of str() + zfill()
+        num_fmt = ("{:0" + str(max(padding, 0)) + "d}").format if add_numbers else None
+
+        # Date lookups are independent and I/O bound, so run them concurrently
+        date_strs = None
+        if add_date and full_paths:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as ex:
+                date_strs = list(ex.map(lambda p: self._compute_date_str(p, date_type, date_format), full_paths))
+
+        # Each step is its own tight pass; disabled steps are skipped as a whole
+        splits = [os.path.splitext(os.path.basename(p)) for p in full_paths]
+        if find_re:
+            names = [find_re.sub(escaped_replace, name) for name, _ in splits]
+        elif find_text:
+            names = [name.replace(find_text, replace_text) for name, _ in splits]
+        else:
+            names = [name for name, _ in splits]
+        blanks = [""] * len(full_paths)
+        nums = [num_fmt(n) for n in range(start_num, start_num + len(full_paths))] if num_fmt else blanks
+        dates = date_strs if date_strs else blanks
+        new_names = [
+            render(name, num_str, date_str) + ext
+            for name, (_, ext), num_str, date_str in zip(names, splits, nums, dates)
+        ]
+
+        # Only rewrite the rows whose shown name actually changes
+        shown_items, shown_names = self._shown_preview or ((), ())
+        if items == shown_items:
+            for item, new_name, shown_name in zip(items, new_names, shown_names):
+                if new_name != shown_name:
+                    self.file_list.item(item, values=(new_name,))
+        else:
+            for item, new_name in zip(items, new_names):
+                self.file_list.item(item, values=(new_name,))
+        self._shown_preview = (items, new_names)
+
+        self._preview_signature = signature
+        self._preview_result = list(zip(full_paths, new_names))
+        return self._preview_result
+
+    def _get_render(self, prefix, suffix):
+        # The listbox is only re-read after it was edited, and the render
+        # function only rebuilt when the pattern, prefix or suffix changed
+        if self._pattern_dirty:
+            self._pattern = "".join(self.pattern_listbox.get(0, tk.END))
+            self._render_key = None
+            self._pattern_dirty = False
+        if self._render_key != (prefix, suffix):
+            self._render = self._compile_pattern(self._pattern, prefix, suffix)
+            self._render_key = (prefix, suffix)
+        return self._render
+
+    def _compile_pattern(self, pattern, prefix, suffix):
+        """Turn the pattern into a render(name, num, date) function.
+
+        The prefix and suffix do not vary between files, so they are folded into
+        the literal text; the generated function is a plain string concatenation.
+        _get_render keeps it until the pattern, prefix or suffix changes.
+        """
+        constants = {"prefix": prefix, "suffix": suffix}
+        terms = []
+        for literal, field, spec, conversion in string.Formatter().parse(pattern):
+            if literal:
+                terms.append(repr(literal))
+            if field is None:
+                continue
+            if spec or conversion:
+                # Uncommon format specs keep the exact str.format semantics
+                return lambda name, num, date: pattern.format(
+                    name=name, prefix=prefix, suffix=suffix, num=num, date=date
+                )
+            if field in constants:
+                if constants[field]:
+                    terms.append(repr(constants[field]))
+            elif field in ("name", "num", "date"):
+                terms.append(field)
+            else:
+                raise KeyError(field)
+
+        return eval(f"lambda name, num, date: {' + '.join(terms) or repr('')}")
+
+    def _stat(self, full_path):
+        # Stat each listed file at most once until the list is reloaded
+        st = self._stat_cache.get(full_path)
+        if st is None:
+            entry = self._dir_entries.get(full_path)
+            st = entry.stat() if entry is not None else os.stat(full_path)
+            self._stat_cache[full_path] = st
+        return st
+
+    def _compute_date_str(self, full_path, date_type, date_format):
+        try:
+            if date_type == "creation":
+                timestamp = self._stat(full_path).st_ctime
+                return _format_datetime(datetime.datetime.fromtimestamp(timestamp), date_format)
+            elif date_type == "modification":
+                timestamp = self._stat(full_path).st_mtime
+                return _format_datetime(datetime.datetime.fromtimestamp(timestamp), date_format)
+            elif date_type == "exif":
                 try:
-                    if date_type == "creation":
-                        timestamp = os.path.getctime(full_path)
-                        date_str = datetime.datetime.fromtimestamp(timestamp).strftime(date_format)
-                    elif date_type == "modification":
-                        timestamp = os.path.getmtime(full_path)
-                        date_str = datetime.datetime.fromtimestamp(timestamp).strftime(date_format)
-                    elif date_type == "exif":
-                        img = Image.open(full_path)
-                        exif_data = img._getexif()
-                        if exif_data:
-                            for tag, value in exif_data.items():
-                                tag_name = ExifTags.TAGS.get(tag, tag)
-                                if tag_name == 'DateTimeOriginal':
-                                    dt_original = datetime.datetime.strptime(value, '%Y:%m:%d %H:%M:%S')
-                                    date_str = dt_original.strftime(date_format)
-                                    break
-                except Exception as e:
-                    print(f"Could not get date for {full_path}: {e}")
-
-            new_name_base = pattern.format(
-                name=name,
-                prefix=prefix,
-                suffix=suffix,
-                num=num_str,
-                date=date_str
-            )
-
-            new_name = f"{new_name_base}{ext}"
-            self.file_list.item(item, values=(new_name,))
+                    value = _exif_datetime_original(full_path)
+                    if value is not None:
+                        value = value.decode('ascii')
+                except (ValueError, struct.error, UnicodeDecodeError):
+                    pil_image = _load_pil_image()
+                    if pil_image is None:
+                        raise RuntimeError("Pillow is required to read EXIF data from this file")
+                    # getexif() decodes IFD0 lazily; only the Exif sub-IFD is read from it
+                    with pil_image.open(full_path) as img:
+                        value = img.getexif().get_ifd(EXIF_IFD_POINTER).get(EXIF_DATETIME_ORIGINAL)
+                if value:
+                    dt_original = datetime.datetime.strptime(value, '%Y:%m:%d %H:%M:%S')
+                    return _format_datetime(dt_original, date_format)
+        except Exception as e:
+            logger.warning("Could not get date for %s: %s", full_path, e)
+        return ""
 
     def rename_files(self):
-        self.preview_rename()
+        # Plan and validate straight from the preview result instead of
+        # reading every row back out of the Treeview
+        planned = []
+        for old_path, new_name in self.preview_rename():
+            new_path = os.path.join(os.path.dirname(old_path), new_name)
+            if new_path != old_path:
+                planned.append((old_path, new_path))
+
+        conflicts = self._find_conflicts(planned)
+        if conflicts:
+            self._show_errors("Rename Conflicts", "Nothing can be renamed because of these conflicts:", conflicts)
+            return
+
         if messagebox.askyesno("Confirm Rename", "Are you sure you want to rename these files?"):
-            import os
-            import logging
+            self.progress_bar["maximum"] = len(planned)
+            self.progress_bar["value"] = 0
+            self._set_busy(True)
+            self._rename_progress = 0
+
+            threading.Thread(target=self._rename_worker, args=(planned,), daemon=True).start()
+            self.after(50, self._drain_progress)
+
+    def _find_conflicts(self, planned):
+        """Return a description of every (old, new) rename that would clobber a file or can't happen."""
+        sources = {os.path.normcase(old_path) for old_path, _ in planned}
+        counts = collections.Counter(os.path.normcase(new_path) for _, new_path in planned)
+        conflicts = []
+        # One directory read per target directory replaces a stat per file; names
+        # are compared normalized and case-folded, and only hits are confirmed
+        # with a real stat
+        existing = {}
+        name_max = {}
+        for old_path, new_path in planned:
+            # Reject names the OS would refuse before anything is staged, so no
+            # file is ever parked under a temp name by a rename that can't happen
+            directory, name = os.path.split(new_path)
+            if directory != os.path.dirname(old_path):
+                conflicts.append(f"{new_path} (name contains a path separator)")
+                continue
+            if directory not in name_max:
+                name_max[directory] = _name_max(directory)
+            problem = _name_problem(name, name_max[directory])
+            if problem:
+                conflicts.append(f"{new_path} ({problem})")
+                continue
+
+            key = os.path.normcase(new_path)
+            count = counts[key]
+            if count > 1:
+                conflicts.append(f"{new_path} ({count} files would get this name)")
+                counts[key] = 0
+            elif count and key not in sources and self._may_exist(new_path, existing):
+                try:
+                    clobbers = os.path.exists(new_path) and not os.path.samefile(old_path, new_path)
+                except OSError as e:
+                    # The source may have vanished since the listing was read
+                    conflicts.append(f"{old_path} (could not be checked: {e})")
+                    continue
+                if clobbers:
+                    conflicts.append(f"{new_path} (already exists)")
+        return conflicts
+
+    def _may_exist(self, path, existing):
+        directory, name = os.path.split(path)
+        if directory not in existing:
+            try:
+                with os.scandir(directory or ".") as it:
+                    existing[directory] = {_fold_name(entry.name) for entry in it}
+            except OSError:
+                existing[directory] = None
+        names = existing[directory]
+        return names is None or _fold_name(name) in names
+
+    def _rename_pairs(self, pairs):
+        """Rename each (src, dst) pair, yielding (src, dst, path, error) as each one finishes.
+
+        path is where the file is afterwards: dst on success, otherwise src or,
+        when src was taken by another pair, a visible fallback name next to it.
+
+        A source that is also the destination of another pair (A -> B, B -> C) is
+        first moved to a temporary name so it is never overwritten; if that move
+        fails, the pair targeting it fails too without touching the disk. After
+        that no two pairs touch the same file, so destination directories are renamed
+        concurrently, each one sequentially by a single thread; this hides the
+        per-call latency of network file systems.
+        """
+        targets = {os.path.normcase(dst) for _, dst in pairs}
+        blocked = set()
+        groups = {}
+        for src, dst in pairs:
+            current = src
+            if os.path.normcase(src) in targets:
+                temp_path = os.path.join(os.path.dirname(src), f".{uuid.uuid4().hex}.renaming")
+                try:
+                    os.replace(src, temp_path)
+                    current = temp_path
+                except OSError as e:
+                    current = e
+                    blocked.add(os.path.normcase(src))
+            groups.setdefault(os.path.dirname(dst), []).append((src, dst, current))
+
+        if len(groups) <= 1:
+            for group in groups.values():
+                for src, dst, current in group:
+                    yield (src, dst, *self._finish_rename(src, dst, current, blocked))
+            return
 
-            logging.basicConfig(filename='rename.log', level=logging.INFO, format='%(asctime)s - %(message)s')
+        results = queue.SimpleQueue()
+
+        def rename_group(group):
+            for src, dst, current in group:
+                results.put((src, dst, *self._finish_rename(src, dst, current, blocked)))
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(RENAME_WORKERS, len(groups))) as ex:
+            for group in groups.values():
+                ex.submit(rename_group, group)
+            for _ in range(len(pairs)):
+                yield results.get()
+
+    def _finish_rename(self, src, dst, current, blocked):
+        """Move current (src itself or its staged temp path) to dst.
+
+        Return (path, error) with the file's final path. A staged file that
+        can't reach dst goes back to src, or to a fallback name when another
+        rename of the batch took src, so it never stays hidden as a temp file.
+        A dst in blocked still holds a file that could not be staged away.
+        """
+        if isinstance(current, OSError):
+            return src, current
+        if os.path.normcase(dst) in blocked:
+            error = OSError(f"{dst} could not be moved out of the way")
+        else:
+            try:
+                os.replace(current, dst)
+                return dst, None
+            except OSError as e:
+                error = e
+        if current == src:
+            return src, error
+        try:
+            path = src if not os.path.exists(src) else self._fallback_path(src)
+            os.replace(current, path)
+            return path, error
+        except OSError:
+            return current, error
+
+    def _fallback_path(self, src):
+        """Return a free name next to src for a file that could not be renamed."""
+        directory, name = os.path.split(src)
+        stem, ext = os.path.splitext(name)
+        name_max = _name_max(directory)
+        for n in itertools.count(1):
+            tag = " (not renamed)" if n == 1 else f" (not renamed {n})"
+            base = stem
+            while base and _name_problem(base + tag + ext, name_max):
+                base = base[:-1]
+            path = os.path.join(directory, base + tag + ext)
+            if not os.path.exists(path):
+                return path
+
+    def _rename_worker(self, planned):
+        # Progress is a plain counter polled by the UI; results are handed over
+        # once at the end instead of as one queue event per file
+        renamed = []
+        errors = []
+        outcomes = []
+        try:
+            # Nothing is logged until every rename is done: opening rename.log
+            # can fail, and must never interrupt a batch with files still staged
+            for outcome in self._rename_pairs(planned):
+                old_path, _, path, error = outcome
+                outcomes.append(outcome)
+                # A file moved to a fallback name is still undoable
+                if path != old_path:
+                    renamed.append((path, old_path))
+                if error is not None:
+                    errors.append(f"{old_path}: {error}" if path == old_path else f"{old_path}: {error} (kept as {path})")
+                self._rename_progress += 1
+        except Exception as e:
+            errors.append(f"The rename batch stopped unexpectedly: {e}")
+        finally:
+            # The UI waits for this hand-over, so it is made whatever happened
+            try:
+                self._log_outcomes(outcomes)
+            except Exception as e:
+                errors.append(f"rename.log could not be written: {e}")
+            self._progress_q.put((renamed, errors))
+
+    def _log_outcomes(self, outcomes):
+        # Check the level once per batch rather than once per file
+        log_renames = logger.isEnabledFor(logging.INFO)
+        for old_path, new_path, path, error in outcomes:
+            if error is None:
+                if log_renames:
+                    logger.info("Renamed '%s' to '%s'", old_path, new_path)
+            elif path != old_path:
+                logger.error("Error renaming '%s' to '%s': %s; kept as '%s'", old_path, new_path, error, path)
+            else:
+                logger.error("Error renaming '%s' to '%s': %s", old_path, new_path, error)
+        self._log_buffer.flush()
+
+    def _drain_progress(self):
+        self.progress_bar["value"] = self._rename_progress
+        try:
+            renamed, errors = self._progress_q.get_nowait()
+        except queue.Empty:
+            self.after(50, self._drain_progress)
+            return
 
-            items = self.file_list.get_children()
-            self.progress_bar["maximum"] = len(items)
-            self.progress_bar["value"] = 0
+        if renamed:
+            self.undo_stack.append(renamed)
+        self._set_busy(False)
 
-            renamed_files = []
+        # Report every failure of the batch in one dialog
+        if errors:
+            self._show_errors("Error", "These files could not be renamed:", errors)
 
-            for i, item in enumerate(items):
-                old_path = self.file_list.item(item, "text")
-                new_name = self.file_list.item(item, "values")[0]
-                new_path = os.path.join(os.path.dirname(old_path), new_name)
+        self.load_files()
 
-                try:
-                    os.rename(old_path, new_path)
-                    renamed_files.append((new_path, old_path))
-                    logging.info(f"Renamed '{old_path}' to '{new_path}'")
-                except Exception as e:
-                    messagebox.showerror("Error", f"Could not rename {old_path}:\n{e}")
-                    logging.error(f"Error renaming '{old_path}' to '{new_path}': {e}")
-
-                self.progress_bar["value"] = i + 1
-                self.update_idletasks()
-            
-            if renamed_files:
-                self.undo_stack.append(renamed_files)
-                self.undo_button["state"] = tk.NORMAL
+    def _set_busy(self, busy):
+        """Lock the controls that touch the listed files while a rename batch runs."""
+        self._busy = busy
+        state = tk.DISABLED if busy else tk.NORMAL
+        for button in (self.rename_button, self.preview_button, self.browse_button):
+            button["state"] = state
+        # Undoing mid-batch would rename the same files from two threads
+        self.undo_button["state"] = tk.NORMAL if self.undo_stack and not busy else tk.DISABLED
 
-            self.load_files()
+    def _on_close(self):
+        if self._busy:
+            messagebox.showwarning("Renaming", "Wait for the current rename batch to finish before closing.")
+            return
+        self.destroy()
+
+    def _show_errors(self, title, intro, lines, limit=20):
+        shown = "\n".join(lines[:limit])
+        if len(lines) > limit:
+            shown += f"\n... and {len(lines) - limit} more"
+        messagebox.showerror(title, f"{intro}\n{shown}")
 
     def undo_rename(self):
         if not self.undo_stack:
             return
 
+        # os.replace would silently overwrite a file created at an original
+        # name since the rename, so undo is checked like a rename batch
+        pairs = list(reversed(self.undo_stack[-1]))
+        conflicts = self._find_conflicts(pairs)
+        if conflicts:
+            self._show_errors("Undo Conflicts", "Nothing can be undone because of these conflicts:", conflicts)
+            return
+
         if messagebox.askyesno("Confirm Undo", "Are you sure you want to undo the last rename operation?"):
-            import os
-            last_rename = self.undo_stack.pop()
-            for new_path, old_path in reversed(last_rename):
-                try:
-                    os.rename(new_path, old_path)
-                except Exception as e:
-                    messagebox.showerror("Error", f"Could not undo rename for {new_path}:\n{e}")
+            self.undo_stack.pop()
+            errors = [
+                f"{new_path}: {error}" if path == new_path else f"{new_path}: {error} (kept as {path})"
+                for new_path, _, path, error in self._rename_pairs(pairs)
+                if error is not None
+            ]
+            if errors:
+                self._show_errors("Error", "These renames could not be undone:", errors)
             
             if not self.undo_stack:
                 self.undo_button["state"] = tk.DISABLED
@@ -315,39 +977,58 @@ class BulkFileRenamer(tk.Tk):
 
     def add_to_pattern(self, part):
         self.pattern_listbox.insert(tk.END, part)
+        self._pattern_dirty = True
 
     def add_separator(self):
-        from tkinter import simpledialog
         separator = simpledialog.askstring("Input", "Enter separator text:", parent=self)
         if separator:
             self.pattern_listbox.insert(tk.END, separator)
+            self._pattern_dirty = True
 
     def remove_from_pattern(self):
         selected_indices = self.pattern_listbox.curselection()
         for i in reversed(selected_indices):
             self.pattern_listbox.delete(i)
+        self._pattern_dirty = True
 
     def move_pattern_item_up(self):
-        selected_indices = self.pattern_listbox.curselection()
-        if not selected_indices:
-            return
-        for i in selected_indices:
-            if i > 0:
-                text = self.pattern_listbox.get(i)
-                self.pattern_listbox.delete(i)
-                self.pattern_listbox.insert(i - 1, text)
-                self.pattern_listbox.selection_set(i - 1)
+        self._shift_pattern_selection(-1)
 
     def move_pattern_item_down(self):
+        self._shift_pattern_selection(1)
+
+    def _shift_pattern_selection(self, step):
         selected_indices = self.pattern_listbox.curselection()
         if not selected_indices:
             return
-        for i in reversed(selected_indices):
-            if i < self.pattern_listbox.size() - 1:
-                text = self.pattern_listbox.get(i)
-                self.pattern_listbox.delete(i)
-                self.pattern_listbox.insert(i + 1, text)
-                self.pattern_listbox.selection_set(i + 1)
+
+        # Reorder in Python, then rewrite only the changed span of the listbox
+        # with a single delete/insert pair
+        shown = self.pattern_listbox.get(0, tk.END)
+        items = list(shown)
+        positions = set(selected_indices)
+        order = selected_indices if step < 0 else reversed(selected_indices)
+        for i in order:
+            j = i + step
+            if 0 <= j < len(items) and j not in positions:
+                items[i], items[j] = items[j], items[i]
+                positions.remove(i)
+                positions.add(j)
+
+        changed = [i for i, (old, new) in enumerate(zip(shown, items)) if old != new]
+        if not changed:
+            return
+        first, last = changed[0], changed[-1]
+        self.pattern_listbox.delete(first, last)
+        self.pattern_listbox.insert(first, *items[first:last + 1])
+        self._pattern_dirty = True
+
+        first, last = min(positions), max(positions)
+        if last - first + 1 == len(positions):
+            self.pattern_listbox.selection_set(first, last)
+        else:
+            for i in positions:
+                self.pattern_listbox.selection_set(i)
 
 
 if __name__ == "__main__":